@@ -1,13 +1,46 @@
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from utils.s3_minio_utils import get_minio_client
 from utils.s3_minio_utils import create_bucket
 from utils.s3_minio_utils import load_data_to_bucket_via_url
-from utils.duckdb_utils import extract_parquet_from_s3
-from utils.duckdb_utils import transform_df
-from utils.duckdb_utils import load_df_to_postgres
+from utils.duckdb_utils import ingest_parquet_to_postgres
 
 YEAR = 2025
 BUCKET_NAME = "nyc-taxi-data"
 BASE_URL = "https://d37ci6vzurychx.cloudfront.net/trip-data/"
+TABLE_NAME = "nyc_taxi_data_2025"
+COLUMNS = [
+    "VendorID",
+    "tpep_pickup_datetime",
+    "tpep_dropoff_datetime",
+    "passenger_count",
+    "trip_distance",
+    "RatecodeID",
+    "store_and_fwd_flag",
+    "PULocationID",
+    "DOLocationID",
+    "payment_type",
+    "fare_amount",
+    "extra",
+    "mta_tax",
+    "tip_amount",
+    "tolls_amount",
+    "improvement_surcharge",
+    "total_amount",
+    "congestion_surcharge",
+    "Airport_fee",
+    "cbd_congestion_fee",
+]
+MAX_WORKERS = 8
+
+# Конфигурация логирования
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+)
 
 
 def main():
@@ -15,24 +48,33 @@ def main():
     client = get_minio_client()
     create_bucket(client, BUCKET_NAME)
 
-    # Загружаем данные в S3
+    # Загружаем данные в S3 параллельно
     files_loaded = []
+    urls = []
     for i in range(1, 13):
         filename = f"yellow_tripdata_{YEAR}-{i:02}.parquet"
         filepath = f"{YEAR}/{i:02}/" + filename
         files_loaded.append(filepath)
-        url = f"{BASE_URL}{filename}"
-        load_data_to_bucket_via_url(client, BUCKET_NAME, filepath, url)
-
-    # 2. Загружаем данные из S3
-    for file in files_loaded:
-        df = extract_parquet_from_s3(BUCKET_NAME, file)
-        df = transform_df(df, file)
-        load_df_to_postgres(
-            table="nyc_taxi_data_2025",
-            df=df,
-            object_name=file,
-        )
+        urls.append(f"{BASE_URL}{filename}")
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(partial(load_data_to_bucket_via_url, client, BUCKET_NAME), files_loaded, urls))
+
+    # Файлы, которые не удалось загрузить в S3, пропускаем: иначе упадет загрузка всего года
+    files_uploaded = [file for file, uploaded in zip(files_loaded, results) if uploaded]
+    files_failed = [file for file, uploaded in zip(files_loaded, results) if not uploaded]
+    if files_failed:
+        logging.error("Файлы не загружены в S3 и будут пропущены: %s", files_failed)
+    if not files_uploaded:
+        raise RuntimeError("Ни один файл не загружен в S3.")
+
+    # 2. Загружаем данные из S3 в Postgres одним запросом: DuckDB читает все файлы параллельно.
+    ingest_parquet_to_postgres(
+        bucket_name=BUCKET_NAME,
+        object_names=files_uploaded,
+        table=TABLE_NAME,
+        columns=COLUMNS,
+    )
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,3 +1,6 @@
+from collections.abc import Mapping
+from functools import cache
+from types import MappingProxyType
 from typing import Any
 
 from dotenv import load_dotenv
@@ -5,42 +8,53 @@ from os import getenv
 from pathlib import Path
 
 env_path = Path(__file__).resolve().parent.parent / "conf" / ".env"
-load_dotenv(dotenv_path=env_path)
 
-CREDS = {
+CREDS_ENV = {
     "minio": {
-        "endpoint": getenv("MINIO_ENDPOINT"),
-        "access_key": getenv("MINIO_ACCESS_KEY"),
-        "secret_key": getenv("MINIO_SECRET_KEY"),
+        "endpoint": "MINIO_ENDPOINT",
+        "access_key": "MINIO_ACCESS_KEY",
+        "secret_key": "MINIO_SECRET_KEY",
     },
     "postgres": {
-        "host": getenv("POSTGRES_HOST"),
-        "port": getenv("POSTGRES_PORT"),
-        "database": getenv("POSTGRES_DB"),
-        "login": getenv("POSTGRES_LOGIN"),
-        "password": getenv("POSTGRES_PASSWORD"),
+        "host": "POSTGRES_HOST",
+        "port": "POSTGRES_PORT",
+        "database": "POSTGRES_DB",
+        "login": "POSTGRES_LOGIN",
+        "password": "POSTGRES_PASSWORD",
     },
 }
 
 
-def get_minio_creds() -> dict[str, Any]:
+@cache
+def _creds(section: str) -> Mapping[str, Any]:
+    """
+    Читает параметры подключения из .env один раз и кэширует их.
+
+    :param section: Секция реквизитов: minio или postgres.
+    :return: Mapping - параметры подключения, только для чтения.
+    """
+    load_dotenv(dotenv_path=env_path)
+    return MappingProxyType({key: getenv(env) for key, env in CREDS_ENV[section].items()})
+
+
+def get_minio_creds() -> Mapping[str, Any]:
     """
     Возвращает параметры подключения к MINIO.
 
-    :return: dict - параметры подключения к MINIO.
+    :return: Mapping - параметры подключения к MINIO.
     """
-    return CREDS["minio"].copy()
+    return _creds("minio")
 
 
-def get_postgres_creds() -> dict[str, Any]:
+def get_postgres_creds() -> Mapping[str, Any]:
     """
     Возвращает параметры подключения к POSTGRES.
 
-    :return: dict - параметры подключения к POSTGRES.
+    :return: Mapping - параметры подключения к POSTGRES.
     """
-    return CREDS["postgres"].copy()
+    return _creds("postgres")
 
 
 if __name__ == "__main__":
     print(get_minio_creds())
-    print(get_postgres_creds())
\ No newline at end of file
+    print(get_postgres_creds())
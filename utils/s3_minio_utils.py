@@ -1,24 +1,82 @@
+import httpx
+import io
 import logging
 import re
-import requests
 
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+from threading import BoundedSemaphore
 from time import time
 
 from minio import Minio
-from minio.datatypes import Bucket
+from minio.datatypes import Bucket, Part
+from minio.error import S3Error
 
 from utils.creds_utils import get_minio_creds
 
 from typing import Any
 
-# Конфигурация логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+logger = logging.getLogger(__name__)
+
+# Допустимые символы и шаблоны для имени bucket
+BUCKET_NAME_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789.-")
+BUCKET_NAME_RE = re.compile(r"[a-z0-9][a-z0-9.\-]*[a-z0-9]")
+IP_ADDRESS_RE = re.compile(r"\d+\.\d+\.\d+\.\d+")
+
+# Размер буфера чтения ответа при потоковой загрузке
+READ_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Количество параллельных Range-запросов на один файл
+RANGE_WORKERS = 4
+
+# Ограничение числа частей, одновременно находящихся в памяти, на весь процесс.
+# Каждая часть буферизуется целиком (part_size), поэтому при параллельной загрузке
+# нескольких файлов память ограничена MAX_PARTS_IN_FLIGHT * part_size (8 * 50MB = 400MB).
+MAX_PARTS_IN_FLIGHT = 8
+PARTS_IN_FLIGHT = BoundedSemaphore(MAX_PARTS_IN_FLIGHT)
+
+# Общий HTTP/2 клиент для HEAD-запросов и потоковых загрузок: запросы мультиплексируются
+# в уже открытых соединениях, без нового TLS-рукопожатия на каждый файл
+HTTP_CLIENT = httpx.Client(
+    http2=True,
+    timeout=60,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+)
+
+# Отдельный HTTP/1.1 клиент для Range-запросов. HTTP/2 свел бы все части в одно TCP-соединение
+# к CDN, а смысл параллельных частей как раз в нескольких независимых соединениях.
+RANGE_CLIENT = httpx.Client(
+    timeout=60,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=MAX_PARTS_IN_FLIGHT, max_keepalive_connections=MAX_PARTS_IN_FLIGHT),
 )
 
-# Параметры подключения
-MINIO_CREDS = get_minio_creds()
+
+class IteratorReader(io.RawIOBase):
+    """
+    Файлоподобная обертка над итератором байтовых блоков.
+    Нужна, чтобы передать потоковый ответ httpx в Minio, который читает данные через read().
+    """
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self.chunks = chunks
+        self.chunk = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.chunk:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                return 0
+            self.chunk = memoryview(chunk)
+        size = min(len(buffer), len(self.chunk))
+        buffer[:size] = self.chunk[:size]
+        self.chunk = self.chunk[size:]
+        return size
 
 def is_valid_bucket_name(name: str) -> bool:
     """
@@ -41,12 +99,13 @@ def is_valid_bucket_name(name: str) -> bool:
     """
     if len(name) < 3 or len(name) > 63:
         return False
-    if not re.fullmatch(r"[a-z0-9][a-z0-9\-\.]*[a-z0-9]", name):
+    # Одна проверка отсекает `_`, заглавные буквы и пробелы
+    if not BUCKET_NAME_CHARS.issuperset(name):
         return False
-    if "_" in name:
+    if not BUCKET_NAME_RE.fullmatch(name):
         return False
     # Проверка на IP-адрес
-    if re.fullmatch(r"\d+\.\d+\.\d+\.\d+", name):
+    if IP_ADDRESS_RE.fullmatch(name):
         return False
     if name.startswith("xn--"):
         return False
@@ -64,10 +123,11 @@ def get_minio_client(secure: bool | None = False) -> Minio:
     """
     if not secure:
         secure = False
+    creds = get_minio_creds()
     return Minio(
-        endpoint=MINIO_CREDS["endpoint"],
-        access_key=MINIO_CREDS["access_key"],
-        secret_key=MINIO_CREDS["secret_key"],
+        endpoint=creds["endpoint"],
+        access_key=creds["access_key"],
+        secret_key=creds["secret_key"],
         secure=secure,
     )
 
@@ -99,11 +159,11 @@ def create_bucket(client: Minio, name: str) -> bool:
     if not is_valid_bucket_name(name):
         raise ValueError("Невалидное имя для bucket.")
     if client.bucket_exists(name):
-        logging.info("Bucket %s already exists.", name)
+        logger.info("Bucket %s already exists.", name)
         return True
     try:
         client.make_bucket(name)
-        logging.info("Bucket %s created.", name)
+        logger.info("Bucket %s created.", name)
         return True
     except Exception as e:
         raise RuntimeError(f"Error while creating bucket") from e
@@ -124,10 +184,101 @@ def remove_bucket(client: Minio, name: str) -> bool:
     if client.bucket_exists(name):
         client.remove_bucket(name)
         return True
-    logging.info("Bucket %s not found.", name)
+    logger.info("Bucket %s not found.", name)
     return False
 
 
+def put_object_via_stream(
+        client: Minio,
+        bucket_name: str,
+        file_path: str,
+        url: str,
+        part_size: int = 50 * 1024 * 1024
+) -> None:
+    """
+    Потоково загружает файл по URL в bucket S3 одним GET-запросом.
+
+    :param client: Объект Minio.
+    :param bucket_name: Имя bucket.
+    :param file_path: Путь файла. Или просто имя файла
+    :param url: Адрес, на котором лежит файл.
+    :param part_size: Размер для батча. По-умолчанию 50MB
+    :return: None.
+    """
+    with HTTP_CLIENT.stream("GET", url) as response:
+        # Проверка статуса = ОК
+        if response.status_code != 200:
+            raise RuntimeError(f"Error while downloading {file_path}: status {response.status_code}.")
+
+        # Размер файла. Если сервер не передал Content-Length или сжимает ответ,
+        # размер заранее неизвестен: Minio загрузит файл multipart-частями по part_size.
+        length = int(response.headers.get("Content-Length", -1))
+        if response.headers.get("Content-Encoding"):
+            length = -1
+
+        # Читаем ответ крупными блоками, а не по ~8KB за системный вызов
+        chunks = response.iter_bytes(chunk_size=READ_BUFFER_SIZE)
+        data = io.BufferedReader(IteratorReader(chunks), buffer_size=READ_BUFFER_SIZE)
+        client.put_object(
+            bucket_name=bucket_name,
+            object_name=file_path,
+            length=length,
+            data=data,
+            part_size=part_size,
+            content_type=response.headers.get("Content-Type", "application/octet-stream"),
+        )
+
+
+def put_object_via_ranges(
+        client: Minio,
+        bucket_name: str,
+        file_path: str,
+        url: str,
+        length: int,
+        part_size: int = 50 * 1024 * 1024,
+        content_type: str = "application/octet-stream",
+        max_workers: int = RANGE_WORKERS,
+) -> None:
+    """
+    Загружает файл по URL в bucket S3 частями.
+    Каждая часть скачивается отдельным Range-запросом и сразу отправляется в Minio
+    как часть multipart upload. Части обрабатываются параллельно, но не более
+    MAX_PARTS_IN_FLIGHT частей одновременно на весь процесс.
+
+    :param client: Объект Minio.
+    :param bucket_name: Имя bucket.
+    :param file_path: Путь файла. Или просто имя файла
+    :param url: Адрес, на котором лежит файл. Сервер должен поддерживать Range-запросы.
+    :param length: Размер файла в байтах.
+    :param part_size: Размер части. По-умолчанию 50MB
+    :param content_type: Content-Type объекта.
+    :param max_workers: Количество параллельно загружаемых частей.
+    :return: None.
+    """
+    upload_id = client._create_multipart_upload(bucket_name, file_path, {"Content-Type": content_type})
+
+    def upload_part(part_number: int) -> Part:
+        first_byte = (part_number - 1) * part_size
+        last_byte = min(first_byte + part_size, length) - 1
+        with PARTS_IN_FLIGHT:
+            response = RANGE_CLIENT.get(
+                url,
+                headers={"Range": f"bytes={first_byte}-{last_byte}", "Accept-Encoding": "identity"},
+            )
+            if response.status_code != 206:
+                raise RuntimeError(f"Error while downloading {file_path}: status {response.status_code}.")
+            etag = client._upload_part(bucket_name, file_path, response.content, None, upload_id, part_number)
+        return Part(part_number, etag)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            parts = list(executor.map(upload_part, range(1, ceil(length / part_size) + 1)))
+        client._complete_multipart_upload(bucket_name, file_path, upload_id, parts)
+    except Exception:
+        client._abort_multipart_upload(bucket_name, file_path, upload_id)
+        raise
+
+
 def load_data_to_bucket_via_url(
         client: Minio,
         bucket_name: str,
@@ -154,44 +305,63 @@ def load_data_to_bucket_via_url(
     if not isinstance(url, str):
         raise TypeError("URL must be a string.")
     if not client.bucket_exists(bucket_name):
-        logging.info("Bucket %s not found.", bucket_name)
+        logger.info("Bucket %s not found.", bucket_name)
 
     # INFO - Начало загрузки
     start = time()
-    logging.info(f"Start of downloading {file_path}.")
-    logging.info(f"Bucket: {bucket_name}, file name: {file_path}, URL: {url}.")
+    logger.info("Start of downloading %s.", file_path)
+    logger.info("Bucket: %s, file name: %s, URL: %s.", bucket_name, file_path, url)
 
+    # Размер файла и поддержка Range-запросов
     try:
-        response = requests.get(url, stream=True, timeout=60)
+        head = HTTP_CLIENT.head(
+            url,
+            headers={"Accept-Encoding": "identity"},
+        )
     except Exception as e:
-        logging.error(f"Error while downloading {file_path}.")
+        logger.error("Error while downloading %s.", file_path)
         return False
+    length = int(head.headers.get("Content-Length", -1))
+    accepts_ranges = head.status_code == 200 and head.headers.get("Accept-Ranges") == "bytes"
 
-    # Проверка статуса = ОК
-    if response.status_code != 200:
-        logging.error(f"Error while downloading {file_path}.")
-        return False
+    # Файл уже есть в bucket с тем же размером - повторно не загружаем
+    try:
+        stat = client.stat_object(bucket_name, file_path)
+    except S3Error:
+        stat = None
+    if stat is not None and head.status_code == 200 and stat.size == length:
+        logger.info("%s already exists in bucket: %s. Skipped.", file_path, bucket_name)
+        return True
 
-    # Размер файла
-    length = int(response.headers.get("Content-Length", -1))
     try:
-        client.put_object(
-            bucket_name=bucket_name,
-            object_name=file_path,
-            length=length,
-            data=response.raw,
-            part_size=part_size,
-            content_type=response.headers.get("Content-Type", "application/octet-stream"),
-        )
+        if accepts_ranges and length > part_size:
+            put_object_via_ranges(
+                client=client,
+                bucket_name=bucket_name,
+                file_path=file_path,
+                url=url,
+                length=length,
+                part_size=part_size,
+                content_type=head.headers.get("Content-Type", "application/octet-stream"),
+            )
+        else:
+            put_object_via_stream(
+                client=client,
+                bucket_name=bucket_name,
+                file_path=file_path,
+                url=url,
+                part_size=part_size,
+            )
     except Exception as e:
-        logging.error(f"Error while uploading {file_path}.")
+        logger.error(e)
+        logger.error("Error while uploading %s.", file_path)
         return False
 
     # INFO - Конец загрузки
     end = time()
-    logging.info(f"Downloaded {file_path} into bucket: {bucket_name}.")
-    logging.info(f"End of downloading {file_path}.")
-    logging.info(f"{file_path} was uploaded in {round((end - start), 2)} seconds.")
+    logger.info("Downloaded %s into bucket: %s.", file_path, bucket_name)
+    logger.info("End of downloading %s.", file_path)
+    logger.info("%s was uploaded in %.2f seconds.", file_path, end - start)
     return True
 
 def get_data_from_bucket(
@@ -214,16 +384,16 @@ def get_data_from_bucket(
     if not isinstance(file_path, str):
         raise TypeError("File name must be a string.")
     if not client.bucket_exists(bucket_name):
-        logging.info("Bucket %s not found.", bucket_name)
+        logger.info("Bucket %s not found.", bucket_name)
         return False
 
     try:
         file = client.get_object(bucket_name, file_path).data
     except Exception as e:
         raise RuntimeError(f"Error while getting {file_path}.")
-    logging.info(f"Успешно получены данные файла: {file_path}.")
+    logger.info("Успешно получены данные файла: %s.", file_path)
     return file
 
 
 if __name__ == "__main__":
-    print(MINIO_CREDS)
\ No newline at end of file
+    print(get_minio_creds())
\ No newline at end of file